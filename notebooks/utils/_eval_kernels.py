@@ -0,0 +1,44 @@
+"""
+_eval_kernels.py
+
+Numeric kernels shared by the single-sample and batched ID paths of `evaluation.py`.
+
+Both take sorted, duplicate-free integer arrays, so membership is a merge of two sorted sequences done in C by `np.searchsorted`: O(|values| log |reference|), with no hashing and no intermediate sets.
+"""
+
+import numpy as np
+
+
+def sorted_membership(values: np.ndarray, reference: np.ndarray) -> np.ndarray:
+    """
+    Return a boolean mask marking which entries of `values` also occur in `reference`.
+
+    Parameters
+    ----------
+    values : np.ndarray
+        A sorted 1-D integer array.
+    reference : np.ndarray
+        A sorted, duplicate-free 1-D integer array.
+
+    Returns
+    -------
+    np.ndarray
+        A boolean array shaped like `values`.
+    """
+    idx = np.searchsorted(reference, values)
+    hit = idx < reference.size
+    hit[hit] = reference[idx[hit]] == values[hit]
+    return hit
+
+
+def sorted_overlap_counts(
+    values: np.ndarray, reference: np.ndarray
+) -> tuple[int, int, int]:
+    """
+    Return `(|values ∩ reference|, |values|, |reference|)` for two sorted, duplicate-free integer arrays.
+    """
+    return (
+        int(np.count_nonzero(sorted_membership(values, reference))),
+        values.size,
+        reference.size,
+    )
@@ -0,0 +1,103 @@
+"""
+hpo_vocab.py
+
+Process-wide interner for HPO term labels.
+
+HPO labels come from a small, closed vocabulary (~17k terms), so each normalized label is mapped once to a dense integer ID. Comparing IDs instead of arbitrary-length strings turns label matching into 4-byte integer hashing and lets the evaluator work on NumPy arrays.
+
+Provides:
+- normalize: the canonical label normalization (strip surrounding whitespace, case-fold).
+- intern: map a single label to its integer ID, assigning a new ID on first sight.
+- intern_many: map an iterable of labels to an `np.int32` array of IDs.
+- intern_set: map a sequence of labels to the set of their IDs.
+
+Limits:
+- Memory: the normalized-label table gains one entry per distinct normalized label and is never shrunk, because IDs already cached (e.g. in `Phenopacket.phenotype_id_set`) must keep their meaning; free-text predictions outside the HPO vocabulary therefore grow it for the life of the process. The per-spelling memo tables are bounded by `_SPELLING_CACHE_LIMIT` and simply start over when full.
+- Threads: new IDs are assigned under a lock, so concurrent callers never hand the same ID to two labels. Lookups of known labels take no lock.
+"""
+
+import sys
+import threading
+from typing import Iterable, Sequence
+
+import numpy as np
+
+# Normalized label -> dense ID; IDs are assigned in first-seen order and never reused
+_LABEL_TO_ID: dict[str, int] = {}
+
+# Raw label -> normalized label, so each distinct spelling is stripped, case-folded and interned once
+_NORMALIZED: dict[str, str] = {}
+
+# Raw label -> ID, so a spelling that has been seen before is resolved with one dict lookup and no string allocation
+_RAW_TO_ID: dict[str, int] = {}
+
+# Entries each per-spelling memo (_NORMALIZED, _RAW_TO_ID) may hold before it is emptied; they only cache work, so emptying them never changes an ID
+_SPELLING_CACHE_LIMIT = 1 << 18
+
+# Serializes ID assignment: reading len(_LABEL_TO_ID) and storing the new entry must happen as one step
+_ASSIGN_LOCK = threading.Lock()
+
+
+def normalize(label: str) -> str:
+    """
+    Normalize a label the same way the evaluator compares labels: strip surrounding whitespace and case-fold.
+
+    `str.casefold` is the Unicode caseless-matching form of `lower` (e.g. "ß" folds to "ss"), at the same cost for ASCII labels. The result is `sys.intern`-ed: every normalized copy of a label is then the same object, so comparing them (in `_LABEL_TO_ID` or in sets of normalized labels) succeeds on the identity check without walking the string. Results are memoized per raw spelling, so a label repeated across packets costs one dict lookup.
+    """
+    normalized = _NORMALIZED.get(label)
+    if normalized is None:
+        if len(_NORMALIZED) >= _SPELLING_CACHE_LIMIT:
+            _NORMALIZED.clear()
+        normalized = _NORMALIZED[label] = sys.intern(label.strip().casefold())
+    return normalized
+
+
+def intern(label: str) -> int:
+    """
+    Return the integer ID of `label`, assigning the next free ID if the normalized label has not been seen before.
+
+    Parameters
+    ----------
+    label : str
+        A raw HPO label (e.g. " Short stature").
+
+    Returns
+    -------
+    int
+        The ID shared by every label that normalizes to the same string.
+    """
+    term_id = _RAW_TO_ID.get(label)
+    if term_id is None:
+        key = normalize(label)
+        term_id = _LABEL_TO_ID.get(key)
+        if term_id is None:
+            with _ASSIGN_LOCK:
+                term_id = _LABEL_TO_ID.setdefault(key, len(_LABEL_TO_ID))
+        if len(_RAW_TO_ID) >= _SPELLING_CACHE_LIMIT:
+            _RAW_TO_ID.clear()
+        _RAW_TO_ID[label] = term_id
+    return term_id
+
+
+def intern_many(labels: Iterable[str]) -> np.ndarray:
+    """
+    Intern every label in `labels`, preserving order and duplicates.
+
+    Returns
+    -------
+    np.ndarray
+        A 1-D `np.int32` array of label IDs.
+    """
+    return np.fromiter((intern(label) for label in labels), dtype=np.int32)
+
+
+def intern_set(labels: Sequence[str]) -> set[int]:
+    """
+    Return the set of IDs of `labels`, as `{intern(label) for label in labels}` would.
+
+    When every spelling has been seen before, the set is filled by `set(map(_RAW_TO_ID.get, labels))`, which runs entirely in C; only if some label is new does it fall back to interning each label in Python.
+    """
+    term_ids = set(map(_RAW_TO_ID.get, labels))
+    if None in term_ids:
+        term_ids = set(map(intern, labels))
+    return term_ids
@@ -1,73 +1,354 @@
 import json
-import copy
+import functools
+import itertools
 import logging
+import mmap
+import os
+import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from logging import NullHandler
-from typing import Any, List
-from google.protobuf.json_format import ParseDict, ParseError
-from phenopackets import Phenopacket as ProtoPhenopacket
+from pathlib import Path
+from types import MappingProxyType
+from typing import (
+    Any,
+    Callable,
+    Iterable,
+    Iterator,
+    List,
+    Mapping,
+    Optional,
+    Sequence,
+    TextIO,
+    Union,
+)
+
+import numpy as np
+
+from notebooks.utils.hpo_vocab import intern, intern_many, normalize
+
+try:
+    # orjson is an optional, much faster parser; its JSONDecodeError subclasses json.JSONDecodeError, so callers catch the same exception with either backend
+    from orjson import loads as _json_loads
+
+    _PARSES_BUFFERS = True
+except ImportError:
+    _PARSES_BUFFERS = False
+
+    def _json_loads(data: Union[str, bytes, bytearray, memoryview]) -> Any:
+        # The standard library parses str, bytes and bytearray, but not other buffers such as memoryview
+        return json.loads(bytes(data) if isinstance(data, memoryview) else data)
+
+
+# Files at least this large are memory-mapped and parsed in place when the parser accepts buffers (orjson); below it, one read() is cheaper than setting up a mapping
+_MMAP_MIN_BYTES = 1 << 20
 
 # Create a module-named logger and attach a NullHandler so this library never prints logs unless an application specifically configures logging
 logger = logging.getLogger(__name__)
 logger.addHandler(NullHandler())
 
 
+@functools.cache
+def _protobuf() -> tuple[type, Callable[..., Any], type[Exception]]:
+    """
+    Import and return `(ProtoPhenopacket, ParseDict, ParseError)` on first use.
+
+    The `phenopackets` schema modules and `google.protobuf` are a large share of this module's import time but are only needed for `strict=True` validation, so importing `phenopacket.py` does not pay for them until a strict packet is validated.
+    """
+    from google.protobuf.json_format import ParseDict, ParseError
+    from phenopackets import Phenopacket as ProtoPhenopacket
+
+    return ProtoPhenopacket, ParseDict, ParseError
+
+
+# One reusable Protobuf message per thread for `strict=True` validation; it is cleared before each use rather than reallocated, and is thread-local because `load_from_files` validates packets on several threads at once
+_proto_local = threading.local()
+
+
+def _validation_message() -> Any:
+    """
+    Return this thread's empty `ProtoPhenopacket` message for ParseDict to validate into.
+    """
+    message = getattr(_proto_local, "message", None)
+    if message is None:
+        message = _proto_local.message = _protobuf()[0]()
+    else:
+        message.Clear()
+    return message
+
+
+# Whitespace characters allowed around JSON values
+_JSON_WHITESPACE = " \t\n\r"
+
+
+def _skip_whitespace(
+    f: TextIO, buffer: str, pos: int, chunk_size: int
+) -> tuple[str, int, bool]:
+    """
+    Advance past JSON whitespace, reading further chunks of `f` as the buffer runs out.
+
+    Returns the (possibly refilled) buffer, the position of the next significant character, and whether the stream ended before one was found.
+    """
+    while True:
+        while pos < len(buffer) and buffer[pos] in _JSON_WHITESPACE:
+            pos += 1
+        if pos < len(buffer):
+            return buffer, pos, False
+        buffer, pos = f.read(chunk_size), 0
+        if not buffer:
+            return buffer, pos, True
+
+
+def _decode_value(
+    f: TextIO, decoder: json.JSONDecoder, buffer: str, pos: int, chunk_size: int
+) -> tuple[Any, str, int]:
+    """
+    Decode the JSON value starting at `buffer[pos]`, reading further chunks of `f` while it runs past the end of the buffer.
+
+    Returns the value, the (possibly refilled) buffer, and the position just after the value.
+    """
+    while True:
+        try:
+            value, end = decoder.raw_decode(buffer, pos)
+        except json.JSONDecodeError as e:
+            error, end = e, None
+        # A value that fails to parse, or ends exactly at the end of the buffer (e.g. a number that may continue in the next chunk), is retried with more input until the stream is exhausted
+        if end is not None and end < len(buffer):
+            return value, buffer, end
+        # Keep the value's start and read at least as much again, so a large value grows the buffer geometrically
+        more = f.read(max(chunk_size, len(buffer) - pos))
+        if not more:
+            if end is None:
+                raise error
+            return value, buffer, end
+        buffer, pos = buffer[pos:] + more, 0
+
+
+def _iter_json_array(
+    f: TextIO, decoder: json.JSONDecoder, buffer: str, pos: int, chunk_size: int
+) -> Iterator[Any]:
+    """
+    Yield the elements of a top-level JSON array whose opening `[` ends just before `buffer[pos]`, then check that only whitespace follows the closing `]`.
+    """
+    buffer, pos, eof = _skip_whitespace(f, buffer, pos, chunk_size)
+    if eof:
+        raise json.JSONDecodeError("Unterminated array", buffer, pos)
+    if buffer[pos] == "]":
+        pos += 1
+    else:
+        while True:
+            if buffer[pos] in ",]":
+                raise json.JSONDecodeError("Expecting value", buffer, pos)
+            element, buffer, pos = _decode_value(f, decoder, buffer, pos, chunk_size)
+            yield element
+            buffer, pos, eof = _skip_whitespace(f, buffer, pos, chunk_size)
+            if eof:
+                raise json.JSONDecodeError("Unterminated array", buffer, pos)
+            if buffer[pos] == "]":
+                pos += 1
+                break
+            if buffer[pos] != ",":
+                raise json.JSONDecodeError("Expecting ',' delimiter", buffer, pos)
+            buffer, pos, eof = _skip_whitespace(f, buffer, pos + 1, chunk_size)
+            if eof:
+                raise json.JSONDecodeError("Unterminated array", buffer, pos)
+    buffer, pos, eof = _skip_whitespace(f, buffer, pos, chunk_size)
+    if not eof:
+        raise json.JSONDecodeError("Extra data", buffer, pos)
+
+
+def _iter_json_documents(f: TextIO, chunk_size: int) -> Iterator[Any]:
+    """
+    Yield the JSON documents of a text stream one at a time, reading it in chunks of `chunk_size` characters.
+
+    The stream may hold a single top-level array (its elements are yielded; they must be separated by exactly one comma, and only whitespace may follow the closing bracket), or any number of documents separated by whitespace, which covers both NDJSON and concatenated JSON. Only the unconsumed tail of the current chunk plus the document being decoded is held in memory; a document larger than the buffer grows it geometrically until it parses.
+
+    Raises
+    ------
+    json.JSONDecodeError
+        If a document, or the top-level array, is malformed or truncated.
+    """
+    decoder = json.JSONDecoder()
+    buffer, pos, eof = _skip_whitespace(f, "", 0, chunk_size)
+    if not eof and buffer[pos] == "[":
+        yield from _iter_json_array(f, decoder, buffer, pos + 1, chunk_size)
+        return
+    while not eof:
+        document, buffer, pos = _decode_value(f, decoder, buffer, pos, chunk_size)
+        yield document
+        buffer, pos, eof = _skip_whitespace(f, buffer, pos, chunk_size)
+
+
+class _cached_slot:
+    """
+    `functools.cached_property` for classes with `__slots__`, which have no instance `__dict__` to cache into.
+
+    The value of property `name` is computed on first access and stored in the slot `_<name>_cache` (leading underscores of `name` stripped), which the owning class must declare.
+    """
+
+    def __init__(self, func) -> None:
+        self.func = func
+        self.__doc__ = func.__doc__
+
+    def __set_name__(self, owner: type, name: str) -> None:
+        self.slot = owner.__dict__[f"_{name.lstrip('_')}_cache"]
+
+    def __get__(self, instance: Any, owner: Any = None) -> Any:
+        if instance is None:
+            return self
+        try:
+            return self.slot.__get__(instance, owner)
+        except AttributeError:
+            value = self.func(instance)
+            self.slot.__set__(instance, value)
+            return value
+
+
 class InvalidPhenopacketError(ValueError):
     """
     Exception raised when a JSON payload does not conform to minimal Phenopacket expectations.
     """
 
 
+def _validate_structure(phenopacket_json: Any) -> List[dict[str, Any]]:
+    """
+    Check the structure `Phenopacket` relies on, without building a Protobuf message, and return the `phenotypicFeatures` list.
+
+    The payload must be a dict whose `phenotypicFeatures` is a list of features, each with a `type` holding a string `label` and, optionally, a string `id`. The features are walked once, and while there each label and ID is replaced in place by its `sys.intern`-ed copy: the same few thousand HPO terms recur across every packet of a cohort, so all packets then share one string object per term, and equality between terms (in the label and ID sets, or `hpo_vocab` lookups) succeeds on the identity check without comparing characters.
+
+    Raises
+    ------
+    InvalidPhenopacketError
+        If the payload does not have this structure.
+    """
+    feats = (
+        phenopacket_json.get("phenotypicFeatures")
+        if isinstance(phenopacket_json, dict)
+        else None
+    )
+    if not isinstance(feats, list):
+        raise InvalidPhenopacketError(
+            "Failed to validate phenopacket: expected a JSON object with a `phenotypicFeatures` list"
+        )
+    try:
+        for feat in feats:
+            term = feat["type"]
+            term["label"] = sys.intern(term["label"])
+            if "id" in term:
+                term["id"] = sys.intern(term["id"])
+    except (TypeError, KeyError) as e:
+        raise InvalidPhenopacketError(
+            f"Failed to validate phenopacket: every phenotypic feature needs a `type` with a string `label` ({e!r})"
+        ) from None
+    return feats
+
+
 class Phenopacket:
 
-    def __init__(self, phenopacket_json: Any) -> None:
+    # Packets are held by the thousands in batch evaluation, so instances carry fixed slots instead of a per-instance `__dict__`; the `_*_cache` slots back the lazily computed `_cached_slot` properties below, and the hot accessors read their slot directly (a C-level lookup) before falling back to the property
+    __slots__ = (
+        "_json",
+        "_phenotypicFeatures",
+        "_labels_cache",
+        "_label_ids_cache",
+        "_label_set_cache",
+        "_id_set_cache",
+        "_normalized_phenotypes_cache",
+        "_phenotype_ids_cache",
+        "_sorted_phenotype_ids_cache",
+    )
+
+    # Caches left out of the pickled state: `hpo_vocab` IDs are only meaningful within the process that assigned them
+    _UNPICKLED_CACHES = frozenset(
+        {"_label_ids_cache", "_phenotype_ids_cache", "_sorted_phenotype_ids_cache"}
+    )
+
+    def __init__(self, phenopacket_json: Any, *, strict: bool = False) -> None:
         """
         Initialize and validate a Phenopacket instance.
 
-        This constructor enforces the GA4GH Phenopacket schema in one step:
-            1. Parses and validates the entire JSON payload against the Protobuf definition via ParseDict (raising ParseError on schema mismatch).
-            2. Attempts to extract `phenotypicFeatures` (raising KeyError if missing, or TypeError if the payload is not indexable as a dict).
+        By default only the structure this class relies on is checked, by walking the payload directly (see `_validate_structure`): it must be a dict whose `phenotypicFeatures` is a list of features, each with a `type` holding a string `label`. With `strict=True` the constructor additionally enforces the full GA4GH Phenopacket schema by parsing the entire payload against the Protobuf definition via ParseDict (raising ParseError on schema mismatch). That builds and discards a complete Protobuf message per packet and costs far more than the rest of construction, so it is opt-in.
 
-        Any caught TypeError, KeyError, or ParseError is re-raised as InvalidPhenopacketError.
+        Any structural failure or caught ParseError is raised as InvalidPhenopacketError.
 
         Parameters
         ----------
         phenopacket_json : Any
-        A JSON-decoded object expected to be a dict representing a GA4GH Phenopacket, with `phenotypicFeatures` as a list of feature dicts.
+        A JSON-decoded object expected to be a dict (or other mapping, e.g. another packet's `to_json()` view) representing a GA4GH Phenopacket, with `phenotypicFeatures` as a list of feature dicts.
+        strict : bool
+            If True, also validate the whole payload against the GA4GH Phenopacket Protobuf schema.
 
         Raises
         ------
         InvalidPhenopacketError
             If validation or extraction fails for any reason.
         """
-        logger.debug("Initializing and Validating Phenopacket")
+        # Per-packet and per-query log calls are guarded so that, with logging off (the library default), the hot paths skip building the call arguments and entering the logging machinery
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Initializing and Validating Phenopacket")
+        # Other mappings, such as the read-only view returned by `to_json()`, are copied into a plain dict (top level only), which `json.dumps` and ParseDict need
+        if isinstance(phenopacket_json, Mapping) and not isinstance(
+            phenopacket_json, dict
+        ):
+            phenopacket_json = dict(phenopacket_json)
         try:
-            _ = ParseDict(phenopacket_json, ProtoPhenopacket())
-            feats = phenopacket_json["phenotypicFeatures"]
-        except (TypeError, ParseError) as e:
-            logger.error("Failed to validate phenopacket: %s", e, exc_info=True)
-            raise InvalidPhenopacketError(f"Failed to validate phenopacket: {e}")
+            feats = _validate_structure(phenopacket_json)
+        except InvalidPhenopacketError as e:
+            logger.error("%s", e)
+            raise
+        if strict:
+            _, parse_dict, parse_error = _protobuf()
+            try:
+                parse_dict(phenopacket_json, _validation_message())
+            except parse_error as e:
+                logger.error("Failed to validate phenopacket: %s", e, exc_info=True)
+                raise InvalidPhenopacketError(f"Failed to validate phenopacket: {e}")
 
-        # If we reach this step then phenopacket_json is guaranteed to be valid, so we can successfully cache the raw JSON and the features list
+        # If we reach this step then phenopacket_json has passed validation, so we can successfully cache the raw JSON and the features list
         self._json = phenopacket_json
-        # We assume the Protobuf-validated dict always has this key:
         self._phenotypicFeatures: List[dict[str, Any]] = feats
-        logger.info("Successfully validated %d phenotypic feature(s)", len(feats))
-        logger.debug("Successfully validated phenotypic feature(s): %r", feats)
+        if logger.isEnabledFor(logging.INFO):
+            logger.info("Successfully validated %d phenotypic feature(s)", len(feats))
+            logger.debug("Successfully validated phenotypic feature(s): %r", feats)
+
+    @classmethod
+    def from_validated(cls, phenopacket_json: dict[str, Any]) -> "Phenopacket":
+        """
+        Wrap a payload that is already known to be valid, skipping every check `__init__` makes.
+
+        For trusted bulk inputs, e.g. payloads that came out of another Phenopacket's `to_json(deep=True)` or were validated upstream: construction is two attribute assignments. Unlike `__init__`, feature labels and IDs are not `sys.intern`-ed, and a malformed payload is not detected here but fails later, on first query, with a bare KeyError or TypeError.
+
+        Parameters
+        ----------
+        phenopacket_json : dict[str, Any]
+            A GA4GH Phenopacket dict with a `phenotypicFeatures` list whose features each have a `type` with a string `label`.
+
+        Returns
+        -------
+        Phenopacket
+            A Phenopacket wrapping `phenopacket_json` as is.
+        """
+        packet = cls.__new__(cls)
+        packet._json = phenopacket_json
+        packet._phenotypicFeatures = phenopacket_json["phenotypicFeatures"]
+        return packet
 
     @classmethod
-    def load_from_file(cls, path: str) -> "Phenopacket":
+    def load_from_file(cls, path: str, *, strict: bool = False) -> "Phenopacket":
         """
         Load a Phenopacket from a JSON file and validate it.
 
         Steps:
             1. Open the file at `path` (FileNotFoundError if missing).
-            2. Parse its contents as JSON (JSONDecodeError on invalid JSON).
-            3. Delegate to __init__ for schema validation.
+            2. Read its raw bytes and parse them as JSON (JSONDecodeError on invalid JSON), with `orjson` if it is installed and the standard library otherwise. With `orjson`, files of 1 MiB or more are memory-mapped and parsed in place instead of being read into memory first.
+            3. Delegate to __init__ for validation.
 
         Parameters
         ----------
         path : str
             Path to the .json file containing a GA4GH Phenopacket.
+        strict : bool
+            If True, validate against the full GA4GH Protobuf schema (see `__init__`).
 
         Returns
         -------
@@ -81,13 +362,182 @@ class Phenopacket:
         json.JSONDecodeError
             If the file contents are not valid JSON.
         InvalidPhenopacketError
-            If the JSON payload fails GA4GH schema validation.
+            If the JSON payload fails validation.
         """
         logger.debug("Loading Phenopacket from file: %s", path)
-        with open(path, "r", encoding="utf-8") as f:
-            data = json.load(f)
+        # Parse the bytes in one call rather than streaming text through `json.load`: this skips the separate UTF-8 decode pass and lets `orjson` parse the buffer directly
+        with open(path, "rb") as f:
+            if _PARSES_BUFFERS and os.fstat(f.fileno()).st_size >= _MMAP_MIN_BYTES:
+                # Large files are parsed straight out of the page cache, without first copying them into a bytes object
+                with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                    with memoryview(mapped) as view:
+                        data = _json_loads(view)
+            else:
+                data = _json_loads(f.read())
         logger.info("Loaded JSON data from %s", path)
-        return cls(data)
+        return cls(data, strict=strict)
+
+    @classmethod
+    def load_from_files(
+        cls,
+        paths: Sequence[str],
+        max_workers: Optional[int] = None,
+        *,
+        strict: bool = False,
+    ) -> List["Phenopacket"]:
+        """
+        Load and validate many single-packet JSON files, reading them concurrently.
+
+        Files are loaded on a thread pool so the wait for one file's disk read overlaps with reading and parsing the others. Parsing itself only runs in parallel with `orjson`, which releases the GIL; with the standard library `json` the gain is limited to overlapping I/O, which dominates for directories of many small files on network or cold storage.
+
+        Parameters
+        ----------
+        paths : Sequence[str]
+            Paths to .json files, each containing one GA4GH Phenopacket.
+        max_workers : int, optional
+            Number of loader threads; None uses the `ThreadPoolExecutor` default, and 1 loads the files serially in the calling thread.
+        strict : bool
+            If True, validate each packet against the full GA4GH Protobuf schema (see `__init__`).
+
+        Returns
+        -------
+        List[Phenopacket]
+            The validated Phenopackets, in the order of `paths`.
+
+        Raises
+        ------
+        FileNotFoundError
+            If a file does not exist.
+        json.JSONDecodeError
+            If a file's contents are not valid JSON.
+        InvalidPhenopacketError
+            If a packet fails validation.
+        """
+        logger.debug("Loading %d Phenopacket file(s)", len(paths))
+        if max_workers == 1 or len(paths) <= 1:
+            return [cls.load_from_file(path, strict=strict) for path in paths]
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            return list(
+                executor.map(
+                    functools.partial(cls.load_from_file, strict=strict), paths
+                )
+            )
+
+    @classmethod
+    def load_from_directory(
+        cls,
+        directory: str,
+        pattern: str = "*.json",
+        max_workers: Optional[int] = None,
+        *,
+        strict: bool = False,
+    ) -> List["Phenopacket"]:
+        """
+        Load and validate every single-packet JSON file in a directory (e.g. a cohort), reading them concurrently.
+
+        Matching files are loaded in sorted path order with `load_from_files`; with `strict=True` every thread reuses its one Protobuf message for validation instead of building one per file.
+
+        Parameters
+        ----------
+        directory : str
+            The directory to scan (not recursively).
+        pattern : str
+            A glob pattern selecting the packet files within `directory`.
+        max_workers : int, optional
+            Number of loader threads, as for `load_from_files`.
+        strict : bool
+            If True, validate each packet against the full GA4GH Protobuf schema (see `__init__`).
+
+        Returns
+        -------
+        List[Phenopacket]
+            The validated Phenopackets, ordered by file path.
+
+        Raises
+        ------
+        FileNotFoundError
+            If `directory` does not exist.
+        json.JSONDecodeError
+            If a file's contents are not valid JSON.
+        InvalidPhenopacketError
+            If a packet fails validation.
+        """
+        root = Path(directory)
+        if not root.is_dir():
+            raise FileNotFoundError(f"No such directory: {directory!r}")
+        paths = sorted(str(path) for path in root.glob(pattern) if path.is_file())
+        logger.info("Found %d Phenopacket file(s) in %s", len(paths), directory)
+        return cls.load_from_files(paths, max_workers, strict=strict)
+
+    @classmethod
+    def from_bytes(
+        cls, raw: Union[bytes, bytearray, memoryview], *, strict: bool = False
+    ) -> "Phenopacket":
+        """
+        Parse and validate a Phenopacket from UTF-8 encoded JSON that is already in memory (e.g. read from a network response or an archive member).
+
+        The buffer is parsed directly, without first being decoded to a `str`; `orjson` is used when it is installed and the standard library `json` otherwise.
+
+        Parameters
+        ----------
+        raw : bytes, bytearray or memoryview
+            The UTF-8 encoded JSON of a GA4GH Phenopacket.
+        strict : bool
+            If True, validate against the full GA4GH Protobuf schema (see `__init__`).
+
+        Returns
+        -------
+        Phenopacket
+            A validated Phenopacket instance.
+
+        Raises
+        ------
+        json.JSONDecodeError
+            If the buffer is not valid JSON.
+        InvalidPhenopacketError
+            If the JSON payload fails validation.
+        """
+        return cls(_json_loads(raw), strict=strict)
+
+    @classmethod
+    def load_many(
+        cls, path: str, chunk_size: int = 1 << 20, *, strict: bool = False
+    ) -> Iterator["Phenopacket"]:
+        """
+        Lazily load and validate every Phenopacket in a multi-document JSON file.
+
+        The file may be a top-level JSON array of packets, NDJSON (one packet per line), or packets simply concatenated one after another. It is read in chunks and each packet is validated and yielded as soon as it has been parsed, so peak memory is about one packet plus one chunk rather than the whole file.
+
+        Parameters
+        ----------
+        path : str
+            Path to the file containing the Phenopackets.
+        chunk_size : int
+            Number of characters read from the file at a time.
+        strict : bool
+            If True, validate each packet against the full GA4GH Protobuf schema (see `__init__`).
+
+        Yields
+        ------
+        Phenopacket
+            Each validated Phenopacket, in file order.
+
+        Raises
+        ------
+        FileNotFoundError
+            If the file does not exist.
+        json.JSONDecodeError
+            If a packet (or the enclosing array) is not valid JSON.
+        InvalidPhenopacketError
+            If a packet fails validation.
+        """
+        logger.debug("Streaming Phenopackets from file: %s", path)
+        with open(path, "r", encoding="utf-8") as f:
+            count = 0
+            for data in _iter_json_documents(f, chunk_size):
+                yield cls(data, strict=strict)
+                count += 1
+        logger.info("Loaded %d Phenopacket(s) from %s", count, path)
 
     def contains_phenotype(self, hpo_label: str) -> bool:
         """
@@ -104,36 +554,178 @@ class Phenopacket:
             True if any phenotypic feature's `type.label` matches exactly,
             False otherwise.
         """
-        present = hpo_label in self.list_phenotypes()
-        logger.debug("Checking for phenotype %r: %s", hpo_label, present)
+        try:
+            label_set = self._label_set_cache
+        except AttributeError:
+            label_set = self._label_set
+        present = hpo_label in label_set
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Checking for phenotype %r: %s", hpo_label, present)
+        return present
+
+    def contains_phenotype_id(self, hpo_id: str) -> bool:
+        """
+        Check for the presence of a phenotype by its HPO term ID.
+
+        Parameters
+        ----------
+        hpo_id : str
+            The HPO term's `id` to search for (e.g. "HP:0004322").
+
+        Returns
+        -------
+        bool
+            True if any phenotypic feature's `type.id` matches exactly,
+            False otherwise.
+        """
+        try:
+            id_set = self._id_set_cache
+        except AttributeError:
+            id_set = self._id_set
+        present = hpo_id in id_set
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Checking for phenotype ID %r: %s", hpo_id, present)
         return present
 
     @property
     def count_phenotypes(self) -> int:
         return len(self._phenotypicFeatures)
 
-    def list_phenotypes(self) -> List[str]:
+    def list_phenotypes(self, as_ids: bool = False) -> Union[List[str], np.ndarray]:
         """
         List all human-readable phenotype labels in this packet.
 
-        Iterates over each feature in `"phenotypicFeatures"` and extracts
-        the `type.label` string.
+        The `type.label` of each feature in `"phenotypicFeatures"` is extracted (and, for `as_ids`, mapped to its `hpo_vocab` ID) once and cached; every call returns a fresh list or array, so callers may mutate it. The labels themselves are `sys.intern`-ed on construction, so the same label from different packets is the same (immutable) string object.
+
+        Parameters
+        ----------
+        as_ids : bool
+            If True, return the labels interned to their `hpo_vocab` integer IDs instead of strings.
 
         Returns
         -------
-        List[str]
-            A list of phenotype labels, in insertion order.
+        List[str] or np.ndarray
+            A list of phenotype labels, in insertion order, or an `np.int32` array of their IDs if `as_ids` is True.
         """
-        labels = [feat["type"]["label"] for feat in self._phenotypicFeatures]
-        logger.debug("Listing phenotypes: %r", labels)
+        if as_ids:
+            return self._label_ids.copy()
+        labels = list(self._labels)
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Listing phenotypes: %r", labels)
         return labels
 
-    def to_json(self) -> dict[str, Any]:
+    @_cached_slot
+    def _labels(self) -> tuple[str, ...]:
+        # Structure was checked once in __init__, so this is a bare comprehension; building a list and converting it is faster than feeding `tuple` a generator or chained `operator.itemgetter` maps
+        return tuple([feat["type"]["label"] for feat in self._phenotypicFeatures])
+
+    @_cached_slot
+    def _label_ids(self) -> np.ndarray:
+        return intern_many(self._labels)
+
+    @_cached_slot
+    def _label_set(self) -> frozenset[str]:
+        return frozenset(self._labels)
+
+    @_cached_slot
+    def _id_set(self) -> frozenset[str]:
+        # OntologyClass.id is optional in the schema, so features without one are skipped rather than raising
+        return frozenset(
+            [
+                feat["type"]["id"]
+                for feat in self._phenotypicFeatures
+                if "id" in feat["type"]
+            ]
+        )
+
+    @_cached_slot
+    def normalized_phenotypes(self) -> frozenset[str]:
+        """
+        The set of phenotype labels stripped of surrounding whitespace and case-folded, as compared by `PhenotypeEvaluator`.
+
+        Computed on first access and cached, so a ground truth scored against many predictions is only normalized once.
+        """
+        return frozenset(map(normalize, self.list_phenotypes()))
+
+    @_cached_slot
+    def _phenotype_ids(self) -> frozenset[int]:
+        return frozenset(map(intern, self.normalized_phenotypes))
+
+    def phenotype_id_set(self) -> frozenset[int]:
+        """
+        Return the `hpo_vocab` IDs of this packet's normalized phenotype labels.
+
+        Interned on first call and cached, so every later evaluation against this packet compares integers without touching its labels again.
+
+        Returns
+        -------
+        frozenset[int]
+            One ID per distinct normalized label.
+        """
+        try:
+            return self._phenotype_ids_cache
+        except AttributeError:
+            return self._phenotype_ids
+
+    @_cached_slot
+    def _sorted_phenotype_ids(self) -> np.ndarray:
+        ids = np.sort(np.fromiter(self._phenotype_ids, dtype=np.int32))
+        ids.flags.writeable = False
+        return ids
+
+    def sorted_phenotype_ids(self) -> np.ndarray:
+        """
+        Return the IDs of `phenotype_id_set()` as a sorted, read-only `np.int32` array.
+
+        Sorted once and cached, so the evaluator can test predicted IDs against it with a binary search (`np.searchsorted`) instead of hashing.
+
+        Returns
+        -------
+        np.ndarray
+            A sorted, duplicate-free 1-D array of `hpo_vocab` IDs.
+        """
+        try:
+            return self._sorted_phenotype_ids_cache
+        except AttributeError:
+            return self._sorted_phenotype_ids
+
+    def __getstate__(self) -> dict[str, Any]:
+        """
+        Pickle the packet with its cached normalized labels, but without the cached `hpo_vocab` IDs.
+
+        The normalized labels are worth carrying to another process (e.g. a `check_phenotypes_parallel` worker) so it does not normalize them again, but IDs are only meaningful within the interner of the process that assigned them and are re-interned on first use after unpickling.
+        """
+        return {
+            attr: getattr(self, attr)
+            for attr in self.__slots__
+            if attr not in self._UNPICKLED_CACHES and hasattr(self, attr)
+        }
+
+    def __setstate__(self, state: dict[str, Any]) -> None:
+        for attr, value in state.items():
+            setattr(self, attr, value)
+
+    def to_json(self, deep: bool = False) -> Mapping[str, Any]:
         """
-        Return a deep copy of the original JSON dict to avoid external mutations because returning the exact same dict/internal state allows for accidental mutations
+        Return the original JSON payload without exposing it to accidental mutation.
+
+        By default this is an O(1) read-only `MappingProxyType` view: inspecting a packet no longer deep-copies its whole JSON tree. The view only guards the top level (nested lists and dicts are the packet's own), and `json.dumps` needs a real dict, so pass `deep=True` for an independent, mutable, serializable copy.
+
+        Parameters
+        ----------
+        deep : bool
+            If True, return a deep copy of the JSON dict instead of a view.
+
+        Returns
+        -------
+        Mapping[str, Any]
+            A read-only view of the payload, or a `dict` deep copy if `deep` is True.
         """
-        logger.debug("Creating deep copy of original JSON")
-        return copy.deepcopy(self._json)
+        if deep:
+            logger.debug("Creating deep copy of original JSON")
+            # The payload is plain JSON data, so a serialize/parse round trip (both sides in C) copies it about twice as fast as `copy.deepcopy`, which dispatches on every node in Python
+            return json.loads(json.dumps(self._json))
+        return MappingProxyType(self._json)
 
     def __repr__(self) -> str:
         return f"<Phenopacket phenotypes={self.count_phenotypes}>"
@@ -146,3 +738,165 @@ class Phenopacket:
         if c == 0:
             return "Phenopacket with no phenotypic features"
         return f"Phenopacket with {c} phenotypic feature{'s' if c != 1 else ''}"
+
+
+def batch_contains(packets: Sequence[Phenopacket], labels: Sequence[str]) -> np.ndarray:
+    """
+    Check many phenotype labels against many Phenopackets at once.
+
+    Equivalent to `[[p.contains_phenotype(label) for label in labels] for p in packets]`, but instead of P x L interpreted lookups it makes one C-level pass over all packet labels, mapping each to its column in `labels` (or -1), and scatters the hits into the result with a single fancy-index assignment.
+
+    Parameters
+    ----------
+    packets : Sequence[Phenopacket]
+        The packets to screen (rows of the result).
+    labels : Sequence[str]
+        The exact phenotype labels to look for (columns of the result).
+
+    Returns
+    -------
+    np.ndarray
+        A boolean array of shape `(len(packets), len(labels))`; entry `[i, j]` is True if packet `i` contains label `j`.
+    """
+    # Each distinct label gets one column; repeated labels are expanded back at the end
+    column_of: dict[str, int] = {}
+    label_columns = [column_of.setdefault(label, len(column_of)) for label in labels]
+    label_tuples = [packet._labels for packet in packets]
+    counts = np.fromiter(
+        map(len, label_tuples), dtype=np.int64, count=len(label_tuples)
+    )
+    columns = np.fromiter(
+        map(
+            column_of.get,
+            itertools.chain.from_iterable(label_tuples),
+            itertools.repeat(-1),
+        ),
+        dtype=np.int64,
+        count=int(counts.sum()),
+    )
+    rows = np.repeat(np.arange(len(label_tuples), dtype=np.int64), counts)
+    hit = columns >= 0
+    result = np.zeros((len(label_tuples), len(column_of)), dtype=bool)
+    result[rows[hit], columns[hit]] = True
+    return result if len(column_of) == len(labels) else result[:, label_columns]
+
+
+class PhenopacketCohort:
+    """
+    An index of the HPO term IDs of many Phenopackets, for cohort-wide queries such as "which packets contain HP:0001250?".
+
+    The term IDs of every packet are flattened once into two parallel NumPy arrays grouped by term (the packet indices of each term, plus the offset at which each term's run starts), so a query is one dict lookup and one array slice instead of a Python loop over `contains_phenotype_id` calls.
+    """
+
+    __slots__ = ("_packets", "_term_codes", "_term_starts", "_packet_indices")
+
+    def __init__(self, packets: Iterable[Phenopacket]) -> None:
+        """
+        Parameters
+        ----------
+        packets : Iterable[Phenopacket]
+            The packets of the cohort; a packet's position in this iterable is its index in query results.
+        """
+        self._packets = tuple(packets)
+        id_sets = [packet._id_set for packet in self._packets]
+        counts = np.fromiter(map(len, id_sets), dtype=np.int64, count=len(id_sets))
+        # Term IDs are coded densely in first-seen order by a cohort-local dict, so any CURIE works, not only numeric "HP:" IDs
+        self._term_codes: dict[str, int] = {}
+        codes = np.fromiter(
+            (
+                self._term_codes.setdefault(term_id, len(self._term_codes))
+                for id_set in id_sets
+                for term_id in id_set
+            ),
+            dtype=np.int64,
+            count=int(counts.sum()),
+        )
+        owners = np.repeat(np.arange(len(id_sets), dtype=np.int64), counts)
+        # A stable sort groups the entries by term while keeping each term's packet indices ascending
+        order = np.argsort(codes, kind="stable")
+        self._packet_indices = owners[order]
+        self._term_starts = np.searchsorted(
+            codes[order], np.arange(len(self._term_codes) + 1)
+        )
+        logger.info(
+            "Indexed %d distinct term ID(s) across %d Phenopacket(s)",
+            len(self._term_codes),
+            len(self._packets),
+        )
+
+    def packets_with(self, hpo_id: str) -> np.ndarray:
+        """
+        Return the indices of the packets that contain a phenotype with this HPO term ID.
+
+        Parameters
+        ----------
+        hpo_id : str
+            The HPO term's `id` to search for (e.g. "HP:0001250").
+
+        Returns
+        -------
+        np.ndarray
+            A sorted `np.int64` array of packet indices, empty if no packet has the term.
+        """
+        code = self._term_codes.get(hpo_id)
+        if code is None:
+            return np.empty(0, dtype=np.int64)
+        start, stop = self._term_starts[code], self._term_starts[code + 1]
+        return self._packet_indices[start:stop].copy()
+
+    def packets_with_any(self, hpo_ids: Iterable[str]) -> np.ndarray:
+        """
+        Return the indices of the packets that contain at least one of the given HPO term IDs.
+
+        Parameters
+        ----------
+        hpo_ids : Iterable[str]
+            HPO term IDs (e.g. a term and its descendants); IDs absent from the cohort are ignored.
+
+        Returns
+        -------
+        np.ndarray
+            A sorted, duplicate-free `np.int64` array of packet indices.
+        """
+        starts = self._term_starts
+        runs = [
+            self._packet_indices[starts[code] : starts[code + 1]]
+            for code in map(self._term_codes.get, hpo_ids)
+            if code is not None
+        ]
+        return np.unique(np.concatenate(runs)) if runs else np.empty(0, np.int64)
+
+    def packet_counts(self, hpo_ids: Sequence[str]) -> np.ndarray:
+        """
+        Return, for each HPO term ID, how many packets of the cohort contain it.
+
+        Parameters
+        ----------
+        hpo_ids : Sequence[str]
+            HPO term IDs to count.
+
+        Returns
+        -------
+        np.ndarray
+            An `np.int64` array aligned with `hpo_ids`, 0 for IDs absent from the cohort.
+        """
+        codes = np.fromiter(
+            (self._term_codes.get(hpo_id, -1) for hpo_id in hpo_ids),
+            dtype=np.int64,
+            count=len(hpo_ids),
+        )
+        known = codes >= 0
+        counts = np.zeros(codes.size, dtype=np.int64)
+        counts[known] = (
+            self._term_starts[codes[known] + 1] - self._term_starts[codes[known]]
+        )
+        return counts
+
+    def __len__(self) -> int:
+        return len(self._packets)
+
+    def __getitem__(self, index: int) -> Phenopacket:
+        return self._packets[index]
+
+    def __repr__(self) -> str:
+        return f"<PhenopacketCohort packets={len(self._packets)} terms={len(self._term_codes)}>"
@@ -5,117 +5,308 @@ Computes:
     - precision =   TP / (TP + FP)
     - recall    =   TP / (TP + FN)
     - f1_score  =   2.(precision.recall)/(precision+recall)
-    - true/false-classification_report via `sklearn.metrics.classification_report()`, and a metadata dict containing:
+    - true/false-classification_report in the text format of `sklearn.metrics.classification_report()`, and a metadata dict containing:
         - creator
         - experiment
         - model
         - date
-        - any extra keywords passed in.
+        - any extra entries passed in via `metadata`.
 """
 
 import json
 import logging
+import time
+from dataclasses import dataclass, field
 from logging import NullHandler
-from datetime import date
-from typing import Any, Dict, List
+from datetime import date, datetime, timedelta
+from types import MappingProxyType
+from typing import Any, Dict, List, Mapping, Optional
 
-from sklearn.metrics import (
-    confusion_matrix as sk_confusion_matrix,
-    precision_score,
-    recall_score,
-    f1_score,
-    classification_report as sk_classification_report,
-)
+import numpy as np
 
 # Silence logger unless the application configures it
 logger = logging.getLogger(__name__)
 logger.addHandler(NullHandler())
 
+# [start, end) of the current local day as POSIX timestamps, and its ISO date string. date.today() alone costs ~0.9us of the ~1.2us that date.today().isoformat() takes, so the cache is keyed on time.time() (~0.08us) rather than on the date
+_ISO_DATE_CACHE: List[Any] = [0.0, 0.0, ""]
 
-class Report:
-    def __init__(
-        self,
-        true_positive: int,
-        false_positive: int,
-        false_negative: int,
-        true_negative: int,
-        creator: str,
-        experiment: str,
-        model: str,
-        **metadata_extra: Any
-    ) -> None:
-        """
-        Parameters
-        ----------
-        true_positive : int
-            Number of exact matches between predicted labels and the ground-truth set.
-        false_positive : int
-            Number of predictions not in the ground truth.
-        false_negative : int
-            Number of ground-truth labels never predicted.
-        true_negative : int
-            Number of "negatives" correctly not predicted. (Usually infinite in our open-world formulation, so in practice we set TN to 0 as a placeholder.)
-        creator : str
-            Identifier of who ran the evaluation.
-        experiment : str
-            Experiment name or ID.
-        model : str
-            Model name or version.
-        **metadata_extra : Any
-            Any additional metadata (e.g. hyperparameters).
-        """
-        self.true_positive = true_positive
-        self.false_positive = false_positive
-        self.false_negative = false_negative
-        self.true_negative = true_negative
-
-        y_true, y_pred = self._build_vectors()
-
-        # Force the class-order [1, 0]
-        cm = sk_confusion_matrix(y_true, y_pred, labels=[1, 0])
-        self.confusion_matrix: List[List[int]] = cm.tolist()
-        #   [TP, FP], [FN, TN]]
-
-        precision = precision_score(y_true, y_pred, average="macro", zero_division=0)
-        recall = recall_score(y_true, y_pred, average="macro", zero_division=0)
-        f1 = f1_score(y_true, y_pred, average="macro", zero_division=0)
-        self.metrics: Dict[str, float] = {
-            "precision": precision,
-            "recall": recall,
-            "f1_score": f1,
+
+def _today_isoformat() -> str:
+    """
+    Return `date.today().isoformat()`, computing the date only when the clock has left the local day it was last computed for.
+    """
+    now = time.time()
+    if not _ISO_DATE_CACHE[0] <= now < _ISO_DATE_CACHE[1]:
+        today = date.fromtimestamp(now)
+        start = datetime(today.year, today.month, today.day)
+        _ISO_DATE_CACHE[:] = [
+            start.timestamp(),
+            (start + timedelta(days=1)).timestamp(),
+            today.isoformat(),
+        ]
+    return _ISO_DATE_CACHE[2]
+
+
+def _safe_div(numerator: float, denominator: float) -> float:
+    """
+    Return numerator / denominator, or 0.0 when the denominator is 0 (sklearn's `zero_division=0`).
+    """
+    return numerator / denominator if denominator else 0.0
+
+
+def _class_prf(tp: int, fp: int, fn: int) -> tuple[float, float, float]:
+    """
+    Precision, recall and F1 of one class from its own TP/FP/FN, with sklearn's `zero_division=0`; F1 is the closed form 2*TP / (2*TP + FP + FN).
+    """
+    return (
+        _safe_div(tp, tp + fp),
+        _safe_div(tp, tp + fn),
+        _safe_div(2 * tp, 2 * tp + fp + fn),
+    )
+
+
+def _binary_macro(tp: int, fp: int, fn: int, tn: int) -> Dict[str, float]:
+    """
+    Macro-averaged precision, recall and F1 over the "present" (1) and "absent" (0) classes, in closed form from the confusion counts.
+
+    Matches `sklearn.metrics.precision_score/recall_score/f1_score(average="macro", zero_division=0)` on the expanded label vectors: a class only enters the average if it occurs in y_true or y_pred, and F1 uses the closed form of `_class_prf`. For the "absent" class the roles swap (its TP is TN, its FP is FN and its FN is FP). With no samples at all the averages are NaN, as in sklearn.
+    """
+    per_class = []
+    if tp + fp + fn:
+        per_class.append(_class_prf(tp, fp, fn))
+    if tn + fp + fn:
+        per_class.append(_class_prf(tn, fn, fp))
+    if not per_class:
+        return {
+            "precision": float("nan"),
+            "recall": float("nan"),
+            "f1_score": float("nan"),
         }
 
-        self.classification_report: str = sk_classification_report(
-            y_true,
-            y_pred,
-            labels=[1, 0],
-            target_names=["present", "absent"],
-            zero_division=0,
+    precision, recall, f1 = (sum(values) / len(per_class) for values in zip(*per_class))
+    return {"precision": precision, "recall": recall, "f1_score": f1}
+
+
+def _format_classification_report(tp: int, fp: int, fn: int, tn: int) -> str:
+    """
+    Closed-form equivalent of `sklearn.metrics.classification_report(y_true, y_pred, labels=[1, 0], target_names=["present", "absent"], zero_division=0)` on the expanded label vectors of the given counts.
+
+    Produces the identical text (same column widths, rounding and row order) from the counts alone, instead of building label lists of length TP+FP+FN+TN for sklearn to re-count. Unlike `metrics`, sklearn's text report averages over both classes whether or not they occur, and this matches it.
+    """
+    total = tp + fp + fn + tn
+    rows = [
+        ("present", *_class_prf(tp, fp, fn), tp + fn),
+        ("absent", *_class_prf(tn, fn, fp), fp + tn),
+    ]
+    (_, p1, r1, f1, s1), (_, p0, r0, f0, s0) = rows
+    # With no correct predictions (TP + TN == 0) sklearn's per-class sums come from np.zeros, so it prints the supports as floats ("3.0")
+    support_total = total if tp + tn else float(total)
+    if not tp + tn:
+        rows = [(*row[:4], float(row[4])) for row in rows]
+
+    width = len("weighted avg")
+    row_fmt = "{:>{width}s} " + " {:>9.2f}" * 3 + " {:>9}\n"
+    report = "{:>{width}s} ".format("", width=width)
+    report += "".join(
+        f" {h:>9}" for h in ("precision", "recall", "f1-score", "support")
+    )
+    report += "\n\n"
+    for row in rows:
+        report += row_fmt.format(*row, width=width)
+    report += "\n"
+    report += "{:>{width}s} {:>9} {:>9}  {:>9.2f} {:>9}\n".format(
+        "accuracy", "", "", _safe_div(tp + tn, total), support_total, width=width
+    )
+    report += row_fmt.format(
+        "macro avg",
+        (p1 + p0) / 2,
+        (r1 + r0) / 2,
+        (f1 + f0) / 2,
+        support_total,
+        width=width,
+    )
+    report += row_fmt.format(
+        "weighted avg",
+        _safe_div(p1 * s1 + p0 * s0, total),
+        _safe_div(r1 * s1 + r0 * s0, total),
+        _safe_div(f1 * s1 + f0 * s0, total),
+        support_total,
+        width=width,
+    )
+    return report
+
+
+@dataclass(frozen=True, slots=True)
+class Report:
+    """
+    Evaluation summary built from raw confusion counts.
+
+    Reports are immutable: the confusion matrix and metrics are derived once on construction and the text report on first access, so none of them can go stale. `metadata` and `metrics` are read-only mappings and `get_metrics` returns a copy. Use `dataclasses.replace` to derive a Report with different counts.
+
+    Equality compares the counts, the identifiers and the metadata; the derived fields are left out since they follow from the counts (and all-zero metrics are NaN, which never compares equal). Hashing uses the counts and identifiers only, as metadata values may be unhashable.
+
+    Attributes
+    ----------
+    true_positive : int
+        Number of exact matches between predicted labels and the ground-truth set.
+    false_positive : int
+        Number of predictions not in the ground truth.
+    false_negative : int
+        Number of ground-truth labels never predicted.
+    true_negative : int
+        Number of "negatives" correctly not predicted. (Usually infinite in our open-world formulation, so in practice we set TN to 0 as a placeholder.)
+    creator : str
+        Identifier of who ran the evaluation.
+    experiment : str
+        Experiment name or ID.
+    model : str
+        Model name or version.
+    metadata : Mapping[str, Any]
+        Any additional metadata (e.g. hyperparameters) on input; after construction a read-only mapping that also holds creator, experiment, model and the date, which take precedence over same-named input keys.
+    confusion_matrix : np.ndarray
+        Read-only 2x2 int64 array [[TP, FN], [FP, TN]], derived from the counts on construction.
+    metrics : Mapping[str, float]
+        Read-only mapping derived from the counts on construction.
+    classification_report : str
+        sklearn-style text report for the counts, built on first access.
+    """
+
+    true_positive: int = 0
+    false_positive: int = 0
+    false_negative: int = 0
+    true_negative: int = 0
+    creator: str = ""
+    experiment: str = ""
+    model: str = ""
+    metadata: Mapping[str, Any] = field(default_factory=dict, hash=False)
+    confusion_matrix: np.ndarray = field(init=False, repr=False, compare=False)
+    metrics: Mapping[str, float] = field(init=False, repr=False, compare=False)
+    _classification_report: Optional[str] = field(
+        default=None, init=False, repr=False, compare=False
+    )
+
+    def __post_init__(self) -> None:
+        # The dataclass is frozen, so the derived fields are set through object.__setattr__
+        # sklearn's confusion_matrix(y_true, y_pred, labels=[1, 0]) layout: rows are the true class, columns the predicted one
+        #   [[TP, FN], [FP, TN]]
+        confusion_matrix = np.array(
+            [
+                [self.true_positive, self.false_negative],
+                [self.false_positive, self.true_negative],
+            ],
+            dtype=np.int64,
+        )
+        confusion_matrix.flags.writeable = False
+        object.__setattr__(self, "confusion_matrix", confusion_matrix)
+
+        object.__setattr__(
+            self,
+            "metrics",
+            MappingProxyType(
+                _binary_macro(
+                    self.true_positive,
+                    self.false_positive,
+                    self.false_negative,
+                    self.true_negative,
+                )
+            ),
         )
-        self.metadata: Dict[str, Any] = {
-            "creator": creator,
-            "experiment": experiment,
-            "model": model,
-            "date": date.today().isoformat(),
-            **metadata_extra,
-        }
 
-    def _build_vectors(self) -> tuple[list[int], list[int]]:
+        object.__setattr__(
+            self,
+            "metadata",
+            # The identifying fields go last: under `dataclasses.replace` the old metadata is passed back in and must not override the new creator, experiment or model
+            MappingProxyType(
+                {
+                    **self.metadata,
+                    "creator": self.creator,
+                    "experiment": self.experiment,
+                    "model": self.model,
+                    "date": _today_isoformat(),
+                }
+            ),
+        )
+
+    @property
+    def classification_report(self) -> str:
         """
-        Internal helper: from the stored TP/FP/FN/TN counts, produce the y_true and y_pred lists in the correct order for sklearn metrics.
+        sklearn-style per-class text report ("present"/"absent") for the stored counts.
+
+        Built on first access and kept, so sweeps that create many Reports but only read their metrics never pay for the text.
+        """
+        if self._classification_report is None:
+            object.__setattr__(
+                self,
+                "_classification_report",
+                _format_classification_report(
+                    self.true_positive,
+                    self.false_positive,
+                    self.false_negative,
+                    self.true_negative,
+                ),
+            )
+        return self._classification_report
+
+    @staticmethod
+    def from_counts_batch(
+        true_positive: Any,
+        false_positive: Any,
+        false_negative: Any,
+        true_negative: Any = 0,
+    ) -> Dict[str, np.ndarray]:
+        """
+        Compute the metrics of many Reports at once from arrays of counts, without building the Reports.
+
+        Each entry equals `Report(...).metrics` for the counts at that position (macro average over the classes that occur, NaN for all-zero counts), computed with a handful of vectorized NumPy divisions instead of one Report per row.
+
+        Parameters
+        ----------
+        true_positive, false_positive, false_negative : array_like of int
+            Per-row confusion counts, all of the same length (e.g. the rows returned by `PhenotypeEvaluator.check_phenotypes_batch`).
+        true_negative : array_like of int
+            Per-row TN counts, or a scalar broadcast to every row (0 in our open-world formulation).
+
+        Returns
+        -------
+        Dict[str, np.ndarray]
+            float64 arrays under the same keys as `metrics`: "precision", "recall" and "f1_score".
         """
-        tp = self.true_positive
-        fp = self.false_positive
-        fn = self.false_negative
-        tn = self.true_negative
+        tp, fp, fn, tn = np.broadcast_arrays(
+            *(
+                np.asarray(c, dtype=np.float64)
+                for c in (true_positive, false_positive, false_negative, true_negative)
+            )
+        )
 
-        y_true = [1] * tp + [1] * fn + [0] * fp + [0] * tn
-        y_pred = [1] * tp + [0] * fn + [1] * fp + [0] * tn
+        def safe_div(numerator: np.ndarray, denominator: np.ndarray) -> np.ndarray:
+            return np.divide(
+                numerator,
+                denominator,
+                out=np.zeros_like(numerator),
+                where=denominator > 0,
+            )
 
-        return y_true, y_pred
+        # An absent class has all-zero counts, so its per-class scores are already 0 and only the number of classes averaged over needs the presence test
+        n_classes = (tp + fp + fn > 0).astype(np.float64) + (tn + fp + fn > 0)
+        per_class = {
+            "precision": safe_div(tp, tp + fp) + safe_div(tn, tn + fn),
+            "recall": safe_div(tp, tp + fn) + safe_div(tn, tn + fp),
+            "f1_score": safe_div(2 * tp, 2 * tp + fp + fn)
+            + safe_div(2 * tn, 2 * tn + fp + fn),
+        }
+        return {
+            name: np.divide(
+                total, n_classes, out=np.full_like(total, np.nan), where=n_classes > 0
+            )
+            for name, total in per_class.items()
+        }
 
     def get_metrics(self) -> Dict[str, float]:
-        return self.metrics
+        """
+        Return a copy of the metrics, so changing it leaves the Report untouched.
+        """
+        return dict(self.metrics)
 
     def get_metric(self, metric: str) -> float:
         """
@@ -129,27 +320,44 @@ class Report:
         """
         return self.classification_report
 
-    def save(self, filepath: str) -> None:
+    def save(
+        self,
+        filepath: str,
+        include_classification_report: bool = True,
+        indent: Optional[int] = 4,
+    ) -> None:
         """
         Persist this Report to disk as JSON.
+
+        Parameters
+        ----------
+        filepath : str
+            Destination .json file.
+        include_classification_report : bool
+            Whether to write the sklearn text report. Pass False when only counts and metrics are needed (e.g. in sweeps) to skip building it; `load` recomputes everything from the counts either way.
+        indent : int, optional
+            Indentation of the pretty-printed JSON; None writes compact JSON (no whitespace), which is smaller and faster to write when many reports are saved.
         """
         payload = {
             "true_positive": self.true_positive,
             "false_positive": self.false_positive,
             "false_negative": self.false_negative,
             "true_negative": self.true_negative,
-            "metadata": self.metadata,
-            "confusion_matrix": self.confusion_matrix,
-            "metrics": self.metrics,
-            "classification_report": self.classification_report,
+            "metadata": dict(self.metadata),
+            "confusion_matrix": self.confusion_matrix.tolist(),
+            "metrics": dict(self.metrics),
         }
+        if include_classification_report:
+            payload["classification_report"] = self.classification_report
+        # The standard library is used rather than orjson: undefined metrics are NaN, which orjson would write as null and refuses to read back
+        separators = (",", ":") if indent is None else None
         with open(filepath, "w", encoding="utf-8") as f:
-            json.dump(payload, f, indent=4)
+            json.dump(payload, f, indent=indent, separators=separators)
 
     @staticmethod
     def load(filepath: str) -> "Report":
         """
-        Load a JSON-dumped Report and reconstruct it. This will pull back the raw counts and metadata, then re-invoke the __init__ logic to recompute metrics and report.
+        Load a JSON-dumped Report and reconstruct it. This will pull back the raw counts and metadata, then re-run __post_init__ to recompute metrics and report.
         """
         with open(filepath, "r", encoding="utf-8") as f:
             data = json.load(f)
@@ -162,7 +370,7 @@ class Report:
             creator=data["metadata"]["creator"],
             experiment=data["metadata"]["experiment"],
             model=data["metadata"]["model"],
-            **{
+            metadata={
                 k: v
                 for k, v in data["metadata"].items()
                 if k not in ("creator", "experiment", "model", "date")
@@ -1,18 +1,35 @@
 # tests/notebooks/utils/test_evaluation.py
 
+import time
+from concurrent.futures import ThreadPoolExecutor
+
 import pytest
+from notebooks.utils import hpo_vocab
 from notebooks.utils.evaluation import PhenotypeEvaluator
-from unittest.mock import Mock
+from notebooks.utils.hpo_vocab import intern, intern_many
+from notebooks.utils.phenopacket import Phenopacket
+
+
+def make_packet(*labels: str) -> Phenopacket:
+    """
+    Build a minimal valid ground-truth Phenopacket holding one phenotypic feature per label.
+    """
+    return Phenopacket(
+        {
+            "phenotypicFeatures": [
+                {"type": {"id": f"HP:{i:07d}", "label": label}}
+                for i, label in enumerate(labels, start=1)
+            ]
+        }
+    )
 
 
 @pytest.fixture
-def mock_ground_truth_packet():
-    mock_packet = Mock()
-    mock_packet.list_phenotypes.return_value = ["Phen1", "Phen2"]
-    return mock_packet
+def ground_truth_packet():
+    return make_packet("Phen1", "Phen2")
 
 
-def test_perfect_prediction_counts(mock_ground_truth_packet):
+def test_perfect_prediction_counts(ground_truth_packet):
     """
     Perfect prediction:
         predicted = ["Phen1","Phen2"]
@@ -21,14 +38,29 @@ def test_perfect_prediction_counts(mock_ground_truth_packet):
     ->  TP=2, FP=0, FN=0
     """
     evaluator = PhenotypeEvaluator()
-    evaluator.check_phenotypes(["Phen1", "Phen2"], mock_ground_truth_packet)
+    evaluator.check_phenotypes(["Phen1", "Phen2"], ground_truth_packet)
 
     assert evaluator.true_positive == 2
     assert evaluator.false_positive == 0
     assert evaluator.false_negative == 0
 
 
-def test_normalization_and_whitespace(mock_ground_truth_packet):
+def test_generator_predictions_match_list(ground_truth_packet):
+    """
+    A one-shot iterable of labels is counted exactly like the equivalent list, rather than being exhausted before it is scored.
+    """
+    labels = ["Phen1", "Other"]
+    from_list = PhenotypeEvaluator()
+    from_list.check_phenotypes(labels, ground_truth_packet)
+    from_generator = PhenotypeEvaluator()
+    from_generator.check_phenotypes((label for label in labels), ground_truth_packet)
+
+    assert from_generator.true_positive == from_list.true_positive == 1
+    assert from_generator.false_positive == from_list.false_positive == 1
+    assert from_generator.false_negative == from_list.false_negative == 1
+
+
+def test_normalization_and_whitespace(ground_truth_packet):
     """
     Whitespace and case should be ignored:
         predicted = [" PHEN1 ", "phen2"]
@@ -37,33 +69,44 @@ def test_normalization_and_whitespace(mock_ground_truth_packet):
     ->  still TP=2, FP=0, FN=0
     """
     evaluator = PhenotypeEvaluator()
-    evaluator.check_phenotypes([" PHEN1 ", "phen2"], mock_ground_truth_packet)
+    evaluator.check_phenotypes([" PHEN1 ", "phen2"], ground_truth_packet)
 
     assert evaluator.true_positive == 2
     assert evaluator.false_positive == 0
     assert evaluator.false_negative == 0
 
 
-def test_complex_example(mock_ground_truth_packet):
+def test_caseless_matching_uses_casefold():
+    """
+    Labels match under Unicode case folding, not just lower-casing ("ß" folds to "ss").
+    """
+    evaluator = PhenotypeEvaluator()
+    evaluator.check_phenotypes(["GROSSE Zehe"], make_packet("große zehe"))
+
+    assert evaluator.true_positive == 1
+    assert evaluator.false_positive == 0
+    assert evaluator.false_negative == 0
+
+
+def test_complex_example(ground_truth_packet):
     """
     Ground truth    =  {A, B, C, E, X}
     Predicted       =  {A, B, D, F}
 
     - A, B -> TP (intersection size = 2)
     - D, F -> FP (each not in ground truth -> size = 2)
-    - ground truth has 5 slots, but only 4 predictions -> FN=1
-        (exactly one true label was never predicted)
+    - C, E, X -> FN (true labels never predicted -> size = 3)
     """
-    mock_ground_truth_packet.list_phenotypes.return_value = ["A", "B", "C", "E", "X"]
+    ground_truth_packet = make_packet("A", "B", "C", "E", "X")
     evaluator = PhenotypeEvaluator()
-    evaluator.check_phenotypes(["A", "B", "D", "F"], mock_ground_truth_packet)
+    evaluator.check_phenotypes(["A", "B", "D", "F"], ground_truth_packet)
 
     assert evaluator.true_positive == 2
     assert evaluator.false_positive == 2
-    assert evaluator.false_negative == 1
+    assert evaluator.false_negative == 3
 
 
-def test_single_truth_no_prediction(mock_ground_truth_packet):
+def test_single_truth_no_prediction(ground_truth_packet):
     """
     Single-label ground truth with no predictions:
         - ground truth  =   ["Z"]
@@ -74,13 +117,236 @@ def test_single_truth_no_prediction(mock_ground_truth_packet):
         - FP = 0    (no predictions at all)
         - FN = 1    (the one true label "Z" was never predicted)
     """
-    # drive everything off the mock: single true label "Z", no predictions
-    mock_ground_truth_packet.list_phenotypes.return_value = ["Z"]
+    # single true label "Z", no predictions
+    ground_truth_packet = make_packet("Z")
     evaluator = PhenotypeEvaluator()
     # no predictions provided
-    evaluator.check_phenotypes([], mock_ground_truth_packet)
+    evaluator.check_phenotypes([], ground_truth_packet)
 
     # verify that the lone true label counts as a false negative
     assert evaluator.true_positive == 0
     assert evaluator.false_positive == 0
     assert evaluator.false_negative == 1
+
+
+def test_ground_truth_normalized_once(ground_truth_packet, monkeypatch):
+    """
+    Scoring several predictions against the same ground truth should only read and normalize its labels once.
+    """
+    calls = []
+    # Phenopacket has `__slots__`, so the method is wrapped on the class rather than the instance
+    list_phenotypes = Phenopacket.list_phenotypes
+    monkeypatch.setattr(
+        Phenopacket,
+        "list_phenotypes",
+        lambda self, *args, **kwargs: calls.append(args)
+        or list_phenotypes(self, *args, **kwargs),
+    )
+    evaluator = PhenotypeEvaluator()
+    evaluator.check_phenotypes(["Phen1"], ground_truth_packet)
+    evaluator.check_phenotypes(["Phen2"], ground_truth_packet)
+
+    assert len(calls) == 1
+    assert evaluator.true_positive == 2
+
+
+def test_interned_ids_match_string_labels(ground_truth_packet):
+    """
+    Predictions given as interned HPO IDs are counted exactly like their string labels.
+    """
+    ground_truth_packet = make_packet("A", "B", "C", "E", "X")
+    from_labels = PhenotypeEvaluator()
+    from_labels.check_phenotypes(["A", "B", "D", "F"], ground_truth_packet)
+
+    from_ids = PhenotypeEvaluator()
+    from_ids.check_phenotypes(intern_many(["a", " B", "D", "F"]), ground_truth_packet)
+
+    assert from_ids.true_positive == from_labels.true_positive
+    assert from_ids.false_positive == from_labels.false_positive
+    assert from_ids.false_negative == from_labels.false_negative
+
+
+class _YieldingDict(dict):
+    """
+    A dict whose `len` releases the GIL, so another thread can run between an ID being read and stored.
+    """
+
+    def __len__(self) -> int:
+        length = super().__len__()
+        time.sleep(0)
+        return length
+
+
+def test_concurrent_interning_assigns_distinct_ids(monkeypatch):
+    """
+    Labels first seen by different threads at the same time never share an ID.
+    """
+    # Fresh tables keep the IDs assigned here out of the process-wide vocabulary
+    monkeypatch.setattr(hpo_vocab, "_LABEL_TO_ID", _YieldingDict())
+    monkeypatch.setattr(hpo_vocab, "_RAW_TO_ID", {})
+    monkeypatch.setattr(hpo_vocab, "_NORMALIZED", {})
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        ids = list(executor.map(intern, (f"concurrent label {i}" for i in range(400))))
+
+    assert sorted(ids) == list(range(len(ids)))
+
+
+def test_spelling_caches_are_bounded(monkeypatch):
+    """
+    The per-spelling memo tables are emptied when full, without changing any label's ID.
+    """
+    monkeypatch.setattr(hpo_vocab, "_SPELLING_CACHE_LIMIT", 4)
+    spellings = [f" Bounded Label {i} " for i in range(10)]
+    ids = [intern(label) for label in spellings]
+
+    assert len(hpo_vocab._RAW_TO_ID) <= 4
+    assert len(hpo_vocab._NORMALIZED) <= 4
+    assert [intern(label.strip().upper()) for label in spellings] == ids
+
+
+@pytest.mark.parametrize("as_ids", [True, False])
+def test_batch_matches_per_sample_evaluation(as_ids):
+    """
+    check_phenotypes_batch must produce the same per-sample and total counts as calling check_phenotypes once per sample,
+    including duplicate predictions and samples with no predictions, whether predictions are label IDs or label strings.
+    """
+    truths = [
+        make_packet("A", "B", "C", "E", "X"),
+        make_packet("Z"),
+        make_packet("Phen1", "Phen2"),
+    ]
+    preds = [["A", "B", "D", "F", "a"], [], ["phen1", "PHEN2", "Phen3"]]
+    if as_ids:
+        preds = [intern_many(pred) for pred in preds]
+
+    expected = []
+    sequential = PhenotypeEvaluator()
+    for pred, truth in zip(preds, truths):
+        before = (
+            sequential.true_positive,
+            sequential.false_positive,
+            sequential.false_negative,
+        )
+        sequential.check_phenotypes(pred, truth)
+        expected.append(
+            [
+                sequential.true_positive - before[0],
+                sequential.false_positive - before[1],
+                sequential.false_negative - before[2],
+            ]
+        )
+
+    batched = PhenotypeEvaluator()
+    per_sample = batched.check_phenotypes_batch(preds, truths)
+
+    assert per_sample.tolist() == expected
+    assert batched.true_positive == sequential.true_positive
+    assert batched.false_positive == sequential.false_positive
+    assert batched.false_negative == sequential.false_negative
+
+
+@pytest.mark.parametrize("result_cache_size", [0, 1, 4096])
+def test_repeated_pairs_accumulate(ground_truth_packet, result_cache_size):
+    """
+    Re-scoring the same (prediction, ground truth) pair must add its counts again, whether or not the result comes from the cache.
+    """
+    evaluator = PhenotypeEvaluator(result_cache_size=result_cache_size)
+    for _ in range(2):
+        evaluator.check_phenotypes(["Phen1", "Phen3"], ground_truth_packet)
+        evaluator.check_phenotypes(["phen2"], ground_truth_packet)
+
+    assert evaluator.true_positive == 4
+    assert evaluator.false_positive == 2
+    assert evaluator.false_negative == 4
+
+
+def test_duplicate_predictions_counted_once(ground_truth_packet):
+    """
+    Predictions that normalize to the same label are counted once:
+        predicted = ["Phen1", " phen1", "PHEN1 ", "Other", "other"]
+        ground    = ["Phen1","Phen2"]
+
+    ->  TP=1 (phen1), FP=1 (other), FN=1 (phen2)
+    """
+    evaluator = PhenotypeEvaluator()
+    evaluator.check_phenotypes(
+        ["Phen1", " phen1", "PHEN1 ", "Other", "other"], ground_truth_packet
+    )
+
+    assert evaluator.true_positive == 1
+    assert evaluator.false_positive == 1
+    assert evaluator.false_negative == 1
+
+
+@pytest.mark.parametrize("n_jobs", [1, 2])
+def test_parallel_matches_sequential_evaluation(n_jobs):
+    """
+    check_phenotypes_parallel must accumulate the same totals as evaluating each sample in turn, for both label and ID predictions.
+    """
+    truths = [make_packet("A", "B", "C", "E", "X"), make_packet("Z")] * 3
+    preds = [["A", "B", "D", "F"], [], ["z", "Y"]] * 2
+    preds[-1] = intern_many(preds[-1])
+
+    sequential = PhenotypeEvaluator()
+    for pred, truth in zip(preds, truths):
+        sequential.check_phenotypes(pred, truth)
+
+    parallel = PhenotypeEvaluator()
+    parallel.check_phenotypes_parallel(preds, truths, n_jobs=n_jobs)
+
+    assert parallel.true_positive == sequential.true_positive
+    assert parallel.false_positive == sequential.false_positive
+    assert parallel.false_negative == sequential.false_negative
+
+
+@pytest.mark.parametrize("n_jobs", [0, -2])
+def test_parallel_rejects_invalid_n_jobs(n_jobs):
+    """
+    check_phenotypes_parallel only accepts -1 or a positive number of workers.
+    """
+    evaluator = PhenotypeEvaluator()
+    with pytest.raises(ValueError, match="n_jobs"):
+        evaluator.check_phenotypes_parallel([["A"]], [make_packet("A")], n_jobs=n_jobs)
+
+
+def test_bulk_report_matches_per_sample_reports():
+    """
+    bulk_report gives, for every row of per-sample counts, the same metrics as a Report built from that row alone.
+    """
+    truths = [make_packet("A", "B", "C", "E", "X"), make_packet("Z"), make_packet("Q")]
+    preds = [["A", "B", "D", "F"], [], ["q"]]
+    counts = PhenotypeEvaluator().check_phenotypes_batch(preds, truths)
+
+    summary = PhenotypeEvaluator.bulk_report(counts)
+
+    assert summary["true_positive"].tolist() == counts[:, 0].tolist()
+    for i, pred in enumerate(preds):
+        evaluator = PhenotypeEvaluator()
+        evaluator.check_phenotypes(pred, truths[i])
+        metrics = evaluator.report("u", "e", "m").get_metrics()
+        for name, value in metrics.items():
+            assert summary[name][i] == pytest.approx(value)
+
+
+def test_threaded_batch_matches_single_pass():
+    """
+    Splitting check_phenotypes_batch over threads returns the same per-sample counts and totals as one vectorized pass.
+    """
+    truths = [
+        make_packet("A", "B", "C", "E", "X"),
+        make_packet("Z"),
+        make_packet("Q"),
+    ] * 3
+    preds = [["A", "B", "D", "F"], [], ["q", "Q "]] * 3
+
+    single = PhenotypeEvaluator()
+    threaded = PhenotypeEvaluator()
+    expected = single.check_phenotypes_batch(preds, truths)
+
+    assert (
+        threaded.check_phenotypes_batch(preds, truths, n_threads=4).tolist()
+        == expected.tolist()
+    )
+    assert threaded.true_positive == single.true_positive
+    assert threaded.false_positive == single.false_positive
+    assert threaded.false_negative == single.false_negative
@@ -1,7 +1,15 @@
 import json
+import pickle
 import tempfile
 import pytest
-from notebooks.utils.phenopacket import Phenopacket, InvalidPhenopacketError
+from notebooks.utils import phenopacket
+from notebooks.utils.hpo_vocab import intern
+from notebooks.utils.phenopacket import (
+    Phenopacket,
+    InvalidPhenopacketError,
+    PhenopacketCohort,
+    batch_contains,
+)
 
 
 @pytest.fixture
@@ -52,6 +60,151 @@ def test_load_from_file(sample_json):
     assert pp.count_phenotypes == len(sample_json["phenotypicFeatures"])
 
 
+def test_load_from_file_memory_mapped(sample_json, tmp_path, monkeypatch):
+    """
+    The memory-mapped path used for large files with a buffer-accepting parser yields the same packet as a plain read.
+    """
+    path = tmp_path / "packet.json"
+    path.write_text(json.dumps(sample_json), encoding="utf-8")
+    seen = []
+    monkeypatch.setattr(phenopacket, "_PARSES_BUFFERS", True)
+    monkeypatch.setattr(phenopacket, "_MMAP_MIN_BYTES", 0)
+    monkeypatch.setattr(
+        phenopacket,
+        "_json_loads",
+        lambda view: seen.append(type(view)) or json.loads(bytes(view)),
+    )
+
+    pp = Phenopacket.load_from_file(str(path))
+
+    assert seen == [memoryview]
+    assert pp.list_phenotypes() == ["Phenotype One", "Phenotype Two", "Phenotype Three"]
+
+
+def test_load_from_file_invalid_json_raises_json_decode_error():
+    """
+    Invalid JSON must raise `json.JSONDecodeError` whichever parser backend (`orjson` or the standard library) is in use.
+    """
+    with tempfile.NamedTemporaryFile(delete=False, mode="w", encoding="utf-8") as f:
+        f.write('{"phenotypicFeatures": [')
+        tmp_path = f.name
+
+    with pytest.raises(json.JSONDecodeError):
+        Phenopacket.load_from_file(tmp_path)
+
+
+@pytest.mark.parametrize("max_workers", [1, 4])
+def test_load_from_files(sample_json, tmp_path, max_workers):
+    """
+    `load_from_files` returns one packet per path, in the order given, whether loaded serially or on a thread pool.
+    """
+    paths = []
+    for n in range(1, 4):
+        path = tmp_path / f"packet_{n}.json"
+        path.write_text(
+            json.dumps({"phenotypicFeatures": sample_json["phenotypicFeatures"][:n]}),
+            encoding="utf-8",
+        )
+        paths.append(str(path))
+
+    loaded = Phenopacket.load_from_files(paths, max_workers=max_workers)
+
+    assert [pp.count_phenotypes for pp in loaded] == [1, 2, 3]
+    with pytest.raises(FileNotFoundError):
+        Phenopacket.load_from_files(
+            paths + [str(tmp_path / "missing.json")], max_workers=max_workers
+        )
+
+
+def test_load_from_directory(sample_json, tmp_path):
+    """
+    `load_from_directory` loads the files matching the pattern, ordered by path, and rejects a missing directory.
+    """
+    for name, n in [("b.json", 2), ("a.json", 1), ("c.json", 3)]:
+        (tmp_path / name).write_text(
+            json.dumps({"phenotypicFeatures": sample_json["phenotypicFeatures"][:n]}),
+            encoding="utf-8",
+        )
+    (tmp_path / "notes.txt").write_text("not a packet", encoding="utf-8")
+
+    loaded = Phenopacket.load_from_directory(str(tmp_path), max_workers=2)
+
+    assert [pp.count_phenotypes for pp in loaded] == [1, 2, 3]
+    with pytest.raises(FileNotFoundError):
+        Phenopacket.load_from_directory(str(tmp_path / "missing"))
+
+
+@pytest.mark.parametrize("wrap", [bytes, bytearray, memoryview])
+def test_from_bytes(sample_json, wrap):
+    """
+    `from_bytes` parses UTF-8 JSON from any in-memory buffer type.
+    """
+    raw = wrap(json.dumps(sample_json).encode("utf-8"))
+    pp = Phenopacket.from_bytes(raw)
+    assert pp.list_phenotypes() == ["Phenotype One", "Phenotype Two", "Phenotype Three"]
+
+
+@pytest.mark.parametrize("layout", ["array", "ndjson", "concatenated"])
+@pytest.mark.parametrize("chunk_size", [7, 1 << 20])
+def test_load_many(sample_json, tmp_path, layout, chunk_size):
+    """
+    `load_many` yields one validated packet per document for every supported layout, including when packets straddle chunk boundaries.
+    """
+    packets = [
+        sample_json,
+        {"phenotypicFeatures": sample_json["phenotypicFeatures"][:1]},
+    ]
+    if layout == "array":
+        text = json.dumps(packets, indent=2)
+    elif layout == "ndjson":
+        text = "\n".join(json.dumps(p) for p in packets) + "\n\n"
+    else:
+        text = "".join(json.dumps(p, indent=2) for p in packets)
+    path = tmp_path / "packets.json"
+    path.write_text(text, encoding="utf-8")
+
+    loaded = list(Phenopacket.load_many(str(path), chunk_size=chunk_size))
+
+    assert [pp.list_phenotypes() for pp in loaded] == [
+        [feat["type"]["label"] for feat in p["phenotypicFeatures"]] for p in packets
+    ]
+
+
+@pytest.mark.parametrize(
+    "text, exc",
+    [
+        ("", None),
+        (" [ ]\n", None),
+        ('[{"phenotypicFeatures": []}', json.JSONDecodeError),
+        ('{"phenotypicFeatures": []}\n{"phenotypicFeatures": [', json.JSONDecodeError),
+        ('[{"phenotypicFeatures": "foo"}]', InvalidPhenopacketError),
+        (
+            '[{"phenotypicFeatures": []}{"phenotypicFeatures": []}]',
+            json.JSONDecodeError,
+        ),
+        ('[,,{"phenotypicFeatures": []}]', json.JSONDecodeError),
+        ('[{"phenotypicFeatures": []},]', json.JSONDecodeError),
+        (
+            '[{"phenotypicFeatures": []},,{"phenotypicFeatures": []}]',
+            json.JSONDecodeError,
+        ),
+        ('[{"phenotypicFeatures": []}] trailing junk', json.JSONDecodeError),
+        ("[]\n[]", json.JSONDecodeError),
+    ],
+)
+def test_load_many_empty_or_invalid(tmp_path, text, exc):
+    """
+    An empty file or array yields nothing; truncated JSON, missing, doubled, leading or trailing commas in an array, and anything after its closing bracket raise `json.JSONDecodeError`; a schema violation raises `InvalidPhenopacketError`.
+    """
+    path = tmp_path / "packets.json"
+    path.write_text(text, encoding="utf-8")
+    if exc is None:
+        assert list(Phenopacket.load_many(str(path), chunk_size=4)) == []
+    else:
+        with pytest.raises(exc):
+            list(Phenopacket.load_many(str(path), chunk_size=4))
+
+
 @pytest.mark.parametrize(
     "bad_input",
     [
@@ -59,6 +212,9 @@ def test_load_from_file(sample_json):
         "just a string",  # wrong top-level type
         123,  # wrong top-level type
         {"phenotypicFeatures": "foo"},  # features must be a list
+        {},  # features are required
+        {"phenotypicFeatures": [{"type": {"id": "HP:0000001"}}]},  # label required
+        {"phenotypicFeatures": ["HP:0000001"]},  # features must be dicts
     ],
 )
 def test_invalid_structure_raises(bad_input):
@@ -79,15 +235,224 @@ def test_invalid_structure_raises(bad_input):
         Phenopacket(bad_input)
 
 
+def test_terms_are_interned(sample_json):
+    """
+    Labels and IDs parsed separately for two packets end up as one shared string object per term.
+    """
+    a, b = (Phenopacket(json.loads(json.dumps(sample_json))) for _ in range(2))
+    assert a.list_phenotypes()[0] is b.list_phenotypes()[0]
+    assert (
+        a.to_json()["phenotypicFeatures"][0]["type"]["id"]
+        is b.to_json()["phenotypicFeatures"][0]["type"]["id"]
+    )
+
+
+def test_from_validated_matches_constructor(sample_json):
+    """
+    `from_validated` wraps a trusted payload without validation, and answers queries like a validated packet.
+    """
+    trusted = Phenopacket.from_validated(sample_json)
+    validated = Phenopacket(sample_json)
+    assert trusted.to_json() == validated.to_json()
+    assert trusted.list_phenotypes() == validated.list_phenotypes()
+    assert trusted.phenotype_id_set() == validated.phenotype_id_set()
+    assert trusted.contains_phenotype_id("HP:0000002")
+
+
+def test_strict_enforces_full_schema(sample_json):
+    """
+    Fields outside the GA4GH schema are only rejected when `strict=True` asks for full Protobuf validation.
+    """
+    payload = {**sample_json, "notAPhenopacketField": 1}
+    assert Phenopacket(payload).count_phenotypes == 3
+    with pytest.raises(InvalidPhenopacketError):
+        Phenopacket(payload, strict=True)
+    assert Phenopacket(sample_json, strict=True).count_phenotypes == 3
+
+
+def test_to_json_is_read_only_view(sample_json):
+    """
+    Ensure to_json() returns a read-only view of the original payload.
+    """
+    pp = Phenopacket(sample_json)
+    out = pp.to_json()
+    assert out == sample_json
+    with pytest.raises(TypeError):
+        out["phenotypicFeatures"] = []
+
+
+def test_round_trip_through_to_json_view(sample_json):
+    """
+    A packet can be rebuilt from another packet's read-only `to_json()` view, including with strict validation and deep copies.
+    """
+    original = Phenopacket(sample_json)
+    for strict in (False, True):
+        rebuilt = Phenopacket(original.to_json(), strict=strict)
+        assert rebuilt.list_phenotypes() == original.list_phenotypes()
+        assert rebuilt.to_json(deep=True) == sample_json
+
+
 def test_to_json_returns_independent_copy(sample_json):
     """
-    Ensure to_json() returns a deep copy, so mutating the result
+    Ensure to_json(deep=True) returns a deep copy, so mutating the result
     does not affect the instance.
     """
     pp = Phenopacket(sample_json)
-    out = pp.to_json()
+    out = pp.to_json(deep=True)
     assert out == sample_json
     # Mutate the returned dict
     out["phenotypicFeatures"].append({"type": {"id": "HP:9999999", "label": "New"}})
     # but the instance is unaffected:
     assert pp.count_phenotypes == len(sample_json["phenotypicFeatures"])
+
+
+def test_list_and_contains_phenotypes(sample_json):
+    """
+    list_phenotypes returns the labels (or their IDs) in order as a fresh list or array each call, and contains_phenotype matches labels exactly.
+    """
+    pp = Phenopacket(sample_json)
+    labels = pp.list_phenotypes()
+    assert labels == ["Phenotype One", "Phenotype Two", "Phenotype Three"]
+
+    labels.append("Mutated")
+    assert pp.list_phenotypes() == ["Phenotype One", "Phenotype Two", "Phenotype Three"]
+
+    assert pp.contains_phenotype("Phenotype Two")
+    assert not pp.contains_phenotype("phenotype two")
+    assert not pp.contains_phenotype("Mutated")
+
+    ids = pp.list_phenotypes(as_ids=True)
+    assert ids.tolist() == [intern(label) for label in pp.list_phenotypes()]
+    ids[0] = -1
+    assert pp.list_phenotypes(as_ids=True)[0] != -1
+
+
+def test_contains_phenotype_id(sample_json):
+    """
+    contains_phenotype_id matches HPO term IDs exactly.
+    """
+    pp = Phenopacket(sample_json)
+    assert pp.contains_phenotype_id("HP:0000002")
+    assert not pp.contains_phenotype_id("HP:0000004")
+    assert not pp.contains_phenotype_id("Phenotype Two")
+
+
+def test_normalized_phenotypes_cached(sample_json):
+    """
+    normalized_phenotypes strips and case-folds every label, and is only computed once per instance.
+    """
+    pp = Phenopacket(sample_json)
+    assert pp.normalized_phenotypes == {
+        "phenotype one",
+        "phenotype two",
+        "phenotype three",
+    }
+    assert pp.normalized_phenotypes is pp.normalized_phenotypes
+
+
+def test_phenotype_id_set_cached(sample_json):
+    """
+    phenotype_id_set returns the interned IDs of the normalized labels, and the same object on every call.
+    """
+    pp = Phenopacket(sample_json)
+    assert pp.phenotype_id_set() == {
+        intern(label) for label in ["Phenotype One", "Phenotype Two", "Phenotype Three"]
+    }
+    assert pp.phenotype_id_set() is pp.phenotype_id_set()
+
+
+def test_sorted_phenotype_ids(sample_json):
+    """
+    sorted_phenotype_ids holds the same IDs as phenotype_id_set, sorted, read-only and computed once.
+    """
+    pp = Phenopacket(sample_json)
+    ids = pp.sorted_phenotype_ids()
+    assert ids.tolist() == sorted(pp.phenotype_id_set())
+    assert not ids.flags.writeable
+    assert pp.sorted_phenotype_ids() is ids
+
+
+def test_phenopacket_has_no_instance_dict(sample_json):
+    """
+    Phenopacket uses `__slots__`, and its lazily cached properties still compute once and return the same object.
+    """
+    pp = Phenopacket(sample_json)
+    assert not hasattr(pp, "__dict__")
+    assert pp.normalized_phenotypes is pp.normalized_phenotypes
+
+
+def test_pickle_keeps_normalized_labels_but_not_ids(sample_json):
+    """
+    A pickled Phenopacket carries its cached normalized labels, while its interned IDs are dropped and recomputed after unpickling.
+    """
+    pp = Phenopacket(sample_json)
+    pp.sorted_phenotype_ids()
+    state = pp.__getstate__()
+    assert "_normalized_phenotypes_cache" in state
+    assert "_phenotype_ids_cache" not in state
+    assert "_sorted_phenotype_ids_cache" not in state
+
+    restored = pickle.loads(pickle.dumps(pp))
+    assert restored.phenotype_id_set() == pp.phenotype_id_set()
+
+
+def test_cohort_packets_with():
+    """
+    PhenopacketCohort.packets_with returns the sorted indices of exactly the packets whose features include the term ID.
+    """
+    id_lists = [
+        ["HP:0000001", "HP:0001250"],
+        [],
+        ["HP:0001250", "HP:0000003"],
+        ["HP:0000003", "ORPHA:558"],
+    ]
+    packets = [
+        Phenopacket(
+            {"phenotypicFeatures": [{"type": {"id": i, "label": i}} for i in ids]}
+        )
+        for ids in id_lists
+    ]
+    cohort = PhenopacketCohort(packets)
+
+    assert len(cohort) == 4
+    assert cohort[2] is packets[2]
+    for term_id in {i for ids in id_lists for i in ids} | {"HP:9999999"}:
+        expected = [
+            n for n, pp in enumerate(packets) if pp.contains_phenotype_id(term_id)
+        ]
+        assert cohort.packets_with(term_id).tolist() == expected
+
+    assert cohort.packets_with_any(
+        ["HP:0000001", "HP:0000003", "HP:9999999"]
+    ).tolist() == [0, 2, 3]
+    assert cohort.packets_with_any(["HP:9999999"]).tolist() == []
+    assert cohort.packet_counts(["HP:0001250", "ORPHA:558", "HP:9999999"]).tolist() == [
+        2,
+        1,
+        0,
+    ]
+
+
+def test_batch_contains_matches_contains_phenotype(sample_json):
+    """
+    batch_contains gives the same answers as calling contains_phenotype for every (packet, label) pair.
+    """
+    packets = [
+        Phenopacket(sample_json),
+        Phenopacket({"phenotypicFeatures": []}),
+        Phenopacket({"phenotypicFeatures": sample_json["phenotypicFeatures"][1:2]}),
+    ]
+    labels = [
+        "Phenotype Two",
+        "phenotype two",
+        "Phenotype One",
+        "Missing",
+        "Phenotype Two",
+    ]
+
+    result = batch_contains(packets, labels)
+
+    assert result.shape == (3, 5)
+    assert result.tolist() == [
+        [pp.contains_phenotype(label) for label in labels] for pp in packets
+    ]
@@ -1,10 +1,37 @@
 # tests/notebooks/utils/test_report.py
 
+import dataclasses
 import json
+from datetime import date, datetime, timedelta
+from types import SimpleNamespace
+
+import numpy as np
 import pytest
 
+from notebooks.utils import report
 from notebooks.utils.report import Report
-from sklearn.metrics import precision_score, recall_score, f1_score
+from sklearn.metrics import (
+    classification_report,
+    confusion_matrix,
+    precision_score,
+    recall_score,
+    f1_score,
+)
+
+
+def build_vectors(rpt: Report) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Expand a Report's TP/FN/FP/TN counts into the y_true and y_pred vectors its closed-form confusion matrix, metrics and text report describe, as the sklearn reference input.
+    """
+    counts = [
+        rpt.true_positive,
+        rpt.false_negative,
+        rpt.false_positive,
+        rpt.true_negative,
+    ]
+    y_true = np.repeat(np.array([1, 1, 0, 0], dtype=np.uint8), counts)
+    y_pred = np.repeat(np.array([1, 0, 1, 0], dtype=np.uint8), counts)
+    return y_true, y_pred
 
 
 @pytest.fixture
@@ -30,7 +57,7 @@ def test_report_initialization_and_confusion_matrix(sample_counts):
         creator="tester",
         experiment="exp1",
         model="modelA",
-        notes="unit test"
+        metadata={"notes": "unit test"},
     )
 
     meta = rpt.metadata
@@ -41,7 +68,7 @@ def test_report_initialization_and_confusion_matrix(sample_counts):
     assert meta["notes"] == "unit test"
 
     # Confusion matrix layout: [[TP,FP],[FN,TN]]
-    assert rpt.confusion_matrix == [[2, 1], [1, 0]]
+    assert rpt.confusion_matrix.tolist() == [[2, 1], [1, 0]]
 
 
 def test_metrics_match_sklearn_macro(sample_counts):
@@ -110,9 +137,200 @@ def test_save_and_load(tmp_path, sample_counts):
 
     rpt2 = Report.load(str(out))
 
-    assert rpt2.confusion_matrix == rpt.confusion_matrix
+    assert data["confusion_matrix"] == rpt.confusion_matrix.tolist()
+    assert np.array_equal(rpt2.confusion_matrix, rpt.confusion_matrix)
 
     assert rpt2.metrics == rpt.metrics
 
     for fld in ("creator", "experiment", "model"):
         assert rpt2.metadata[fld] == rpt.metadata[fld]
+
+
+def test_classification_report_built_lazily(sample_counts):
+    """
+    The text report is only built when first read, and is then reused.
+    """
+    rpt = Report(**sample_counts, creator="u", experiment="e", model="m")
+    assert rpt._classification_report is None
+
+    text = rpt.classification_report
+    assert "present" in text and "absent" in text
+    assert rpt.classification_report is text
+    assert str(rpt) is text
+
+
+def test_report_is_immutable(sample_counts):
+    """
+    Counts cannot be reassigned after construction, so the derived metrics and cached text report never go stale.
+    """
+    rpt = Report(**sample_counts)
+    with pytest.raises(dataclasses.FrozenInstanceError):
+        rpt.true_positive = 0
+    updated = dataclasses.replace(rpt, true_positive=0)
+    assert updated.confusion_matrix[0, 0] == 0
+    assert rpt.confusion_matrix[0, 0] == sample_counts["true_positive"]
+
+
+def test_replace_updates_metadata(tmp_path, sample_counts):
+    """
+    dataclasses.replace refreshes the identifying metadata instead of carrying over the old values, and the change survives a save/load round trip.
+    """
+    rpt = Report(**sample_counts, creator="alice", metadata={"notes": "unit test"})
+    updated = dataclasses.replace(rpt, creator="bob")
+    assert updated.creator == "bob"
+    assert updated.metadata["creator"] == "bob"
+    assert updated.metadata["notes"] == "unit test"
+
+    out = tmp_path / "replaced.json"
+    updated.save(str(out))
+    assert Report.load(str(out)) == updated
+
+
+def test_report_date_follows_the_clock(monkeypatch):
+    """
+    The cached ISO date is today's date and moves on once the clock passes into the next day.
+    """
+    assert Report().metadata["date"] == date.today().isoformat()
+    tomorrow = date.today() + timedelta(days=1)
+    noon = datetime(tomorrow.year, tomorrow.month, tomorrow.day, 12).timestamp()
+    monkeypatch.setattr(report, "time", SimpleNamespace(time=lambda: noon))
+    assert Report().metadata["date"] == tomorrow.isoformat()
+
+
+def test_report_mappings_are_read_only(sample_counts):
+    """
+    metrics and metadata cannot be changed in place, and get_metrics hands out a copy.
+    """
+    rpt = Report(**sample_counts, metadata={"notes": "unit test"})
+    with pytest.raises(TypeError):
+        rpt.metrics["precision"] = 0.0
+    with pytest.raises(TypeError):
+        rpt.metadata["notes"] = "changed"
+    copied = rpt.get_metrics()
+    copied["precision"] = -1.0
+    assert rpt.get_metric("precision") != -1.0
+    assert dataclasses.replace(rpt, true_positive=0).metadata["notes"] == "unit test"
+
+
+def test_report_equality_and_hash():
+    """
+    Reports with the same counts and identifiers compare equal and hash alike, even when every count is zero and the metrics are NaN.
+    """
+    first = Report(creator="u", metadata={"params": [1, 2]})
+    second = Report(creator="u", metadata={"params": [1, 2]})
+    assert np.isnan(first.get_metric("f1_score"))
+    assert first == second
+    assert hash(first) == hash(second)
+    assert first != Report(creator="v", metadata={"params": [1, 2]})
+
+
+@pytest.mark.parametrize(
+    "counts",
+    [
+        (2, 1, 1, 0),
+        (3, 0, 0, 0),
+        (0, 2, 0, 0),
+        (0, 0, 4, 0),
+        (1, 0, 2, 5),
+        (0, 0, 0, 3),
+    ],
+)
+def test_metrics_match_expanded_vectors(counts):
+    """
+    Closed-form metrics and confusion matrix equal sklearn's results on the fully expanded label vectors,
+    including count combinations where one class is absent.
+    """
+    tp, fp, fn, tn = counts
+    rpt = Report(tp, fp, fn, tn, creator="u", experiment="e", model="m")
+    y_true, y_pred = build_vectors(rpt)
+
+    assert rpt.confusion_matrix.dtype == np.int64
+    assert rpt.confusion_matrix.tolist() == [[tp, fn], [fp, tn]]
+    assert np.array_equal(
+        rpt.confusion_matrix, confusion_matrix(y_true, y_pred, labels=[1, 0])
+    )
+    assert rpt.get_metric("precision") == pytest.approx(
+        precision_score(y_true, y_pred, average="macro", zero_division=0)
+    )
+    assert rpt.get_metric("recall") == pytest.approx(
+        recall_score(y_true, y_pred, average="macro", zero_division=0)
+    )
+    assert rpt.get_metric("f1_score") == pytest.approx(
+        f1_score(y_true, y_pred, average="macro", zero_division=0)
+    )
+
+
+def test_from_counts_batch_matches_reports():
+    """
+    from_counts_batch returns, row by row, the same metrics as building a Report from each row's counts.
+    """
+    rows = [
+        (2, 1, 1, 0),
+        (3, 0, 0, 0),
+        (0, 2, 0, 0),
+        (0, 0, 4, 0),
+        (1, 0, 2, 5),
+        (0, 0, 0, 0),
+    ]
+    tp, fp, fn, tn = (list(col) for col in zip(*rows))
+
+    batch = Report.from_counts_batch(tp, fp, fn, tn)
+
+    for i, counts in enumerate(rows):
+        rpt = Report(*counts, creator="u", experiment="e", model="m")
+        for name, value in rpt.get_metrics().items():
+            assert batch[name][i] == pytest.approx(value, nan_ok=True)
+
+
+def test_save_without_classification_report(tmp_path, sample_counts):
+    """
+    Saving with include_classification_report=False neither builds nor writes the text report, and the file still loads.
+    """
+    rpt = Report(**sample_counts, creator="tester", experiment="exp3", model="modelC")
+    out = tmp_path / "report.json"
+    rpt.save(str(out), include_classification_report=False)
+
+    assert rpt._classification_report is None
+    assert "classification_report" not in json.loads(out.read_text(encoding="utf-8"))
+    assert Report.load(str(out)).metrics == rpt.metrics
+
+
+def test_save_compact(tmp_path, sample_counts):
+    """
+    `indent=None` writes compact single-line JSON that loads back to an equal Report.
+    """
+    rpt = Report(**sample_counts, creator="u", experiment="e", model="m")
+    path = tmp_path / "compact.json"
+    rpt.save(str(path), indent=None)
+
+    text = path.read_text(encoding="utf-8")
+    assert "\n" not in text and ", " not in text
+    assert Report.load(str(path)) == rpt
+
+
+@pytest.mark.parametrize(
+    "counts",
+    [
+        (2, 1, 1, 0),
+        (3, 0, 0, 0),
+        (0, 2, 1, 0),
+        (0, 0, 0, 0),
+        (1, 0, 2, 5),
+        (1234, 567, 89, 0),
+    ],
+)
+def test_classification_report_matches_sklearn(counts):
+    """
+    The closed-form text report is character-for-character what sklearn prints for the expanded label vectors,
+    including the float supports sklearn emits when there are no correct predictions.
+    """
+    rpt = Report(*counts, creator="u", experiment="e", model="m")
+    y_true, y_pred = build_vectors(rpt)
+
+    assert rpt.classification_report == classification_report(
+        y_true,
+        y_pred,
+        labels=[1, 0],
+        target_names=["present", "absent"],
+        zero_division=0,
+    )